@@ -6,7 +6,7 @@ import l18n
 from django.contrib.auth import get_user_model
 from django.contrib.auth.views import redirect_to_login as auth_redirect_to_login
 from django.core.exceptions import PermissionDenied
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils.timezone import activate as activate_tz
@@ -21,25 +21,37 @@ def users_with_page_permission(page, permission_type, include_superusers=True):
     # Get user model
     User = get_user_model()
 
-    # Find GroupPagePermission records of the given type that apply to this page or an ancestor
-    ancestors_and_self = list(page.get_ancestors()) + [page]
-    perm = GroupPagePermission.objects.filter(permission_type=permission_type, page__in=ancestors_and_self)
-    q = Q(groups__page_permissions__in=perm)
+    # Find users belonging to a group with a GroupPagePermission record of the given type that
+    # applies to this page or an ancestor. This is checked with an EXISTS subquery rather than
+    # joining through the groups, so that the users don't have to be de-duplicated afterwards.
+    # The treebeard path of each ancestor is a prefix of the page's own path, so the ancestors
+    # are matched on those paths rather than being looked up first
+    ancestor_and_self_paths = [
+        page.path[0:pos]
+        for pos in range(page.steplen, len(page.path) + 1, page.steplen)
+    ]
+    has_page_permission = Exists(GroupPagePermission.objects.filter(
+        permission_type=permission_type, page__path__in=ancestor_and_self_paths, group__user=OuterRef('pk')
+    ))
+    q = Q(_has_page_permission=True)
 
     # Include superusers
     if include_superusers:
         q |= Q(is_superuser=True)
 
-    return User.objects.filter(is_active=True).filter(q).distinct()
+    return User.objects.annotate(_has_page_permission=has_page_permission).filter(q, is_active=True)
+
+
+def _is_ajax(request):
+    # Equivalent to request.is_ajax(), which is deprecated as of Django 3.1
+    return request.META.get('HTTP_X_REQUESTED_WITH') == 'XMLHttpRequest'
 
 
 def permission_denied(request):
     """Return a standard 'permission denied' response"""
-    if request.is_ajax():
+    if _is_ajax(request):
         raise PermissionDenied
 
-    from wagtail.admin import messages
-
     messages.error(request, _('Sorry, you do not have permission to access this area.'))
     return redirect('wagtailadmin_home')
 
@@ -85,12 +97,11 @@ def any_permission_required(*perms):
     Decorator that accepts a list of permission names, and allows the user
     to pass if they have *any* of the permissions in the list
     """
-    def test(user):
-        for perm in perms:
-            if user.has_perm(perm):
-                return True
+    perms = frozenset(perms)
 
-        return False
+    def test(user):
+        has_perm = user.has_perm
+        return any(has_perm(perm) for perm in perms)
 
     return user_passes_test(test)
 
@@ -129,9 +140,13 @@ def user_has_any_page_permission(user):
     if user.is_superuser:
         return True
 
+    # Cache the result on the user object, as this is checked several times per admin page.
+    if not hasattr(user, '_wagtail_has_any_page_permission'):
+        user._wagtail_has_any_page_permission = GroupPagePermission.objects.filter(group__user=user).exists()
+
     # At least one of the users groups has a GroupPagePermission.
     # The user can probably do something.
-    if GroupPagePermission.objects.filter(group__in=user.groups.all()).exists():
+    if user._wagtail_has_any_page_permission:
         return True
 
     # Specific permissions for a page type do not mean anything.
@@ -141,7 +156,7 @@ def user_has_any_page_permission(user):
 
 
 def reject_request(request):
-    if request.is_ajax():
+    if _is_ajax(request):
         raise PermissionDenied
 
     return auth_redirect_to_login(
@@ -187,7 +202,7 @@ def require_admin_access(view_func):
             else:
                 return view_func(request, *args, **kwargs)
 
-        if not request.is_ajax():
+        if not _is_ajax(request):
             messages.error(request, _('You do not have permission to access the admin'))
 
         return reject_request(request)
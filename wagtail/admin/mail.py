@@ -1,11 +1,13 @@
 import logging
+from operator import attrgetter
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.mail import get_connection
 from django.core.mail.message import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils.translation import override
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+from django.template.loader import get_template
+from django.utils.translation import get_language, override
 
 from wagtail.admin.auth import users_with_page_permission
 from wagtail.core.models import GroupApprovalTask, PageRevision, TaskState, WorkflowState
@@ -15,6 +17,16 @@ from wagtail.users.models import UserProfile
 
 logger = logging.getLogger('wagtail.admin')
 
+# The subject, text and HTML templates for each type of notification sent by send_notification
+NOTIFICATION_TEMPLATES = {
+    notification: (
+        'wagtailadmin/notifications/%s_subject.txt' % notification,
+        'wagtailadmin/notifications/%s.txt' % notification,
+        'wagtailadmin/notifications/%s.html' % notification,
+    )
+    for notification in ['submitted', 'rejected', 'approved']
+}
+
 
 class OpenedConnection:
     """Context manager for mail connections to ensure they are closed when manually opened"""
@@ -63,37 +75,59 @@ def send_mail(subject, message, recipient_list, from_email=None, **kwargs):
 
 
 def send_notification(page_revision_id, notification, excluded_user_id):
-    # Get revision
-    revision = PageRevision.objects.get(id=page_revision_id)
+    try:
+        template_subject, template_text, template_html = NOTIFICATION_TEMPLATES[notification]
+    except KeyError:
+        return False
+
+    # Get revision, along with the page and user that are used to find the recipients and are
+    # rendered in the templates. The revision content itself is not needed, and can be large
+    revision = PageRevision.objects.select_related('page', 'user').defer('content_json').get(id=page_revision_id)
 
     # Get list of recipients
     if notification == 'submitted':
         # Get list of publishers
         include_superusers = getattr(settings, 'WAGTAILADMIN_NOTIFICATION_INCLUDE_SUPERUSERS', True)
-        recipients = users_with_page_permission(revision.page, 'publish', include_superusers)
-    elif notification in ['rejected', 'approved']:
+        # Evaluated up front, as the recipients are iterated over more than once below
+        recipients = list(users_with_page_permission(revision.page, 'publish', include_superusers))
+    else:
         # Get submitter
         recipients = [revision.user]
-    else:
-        return False
 
-    # Get list of email addresses
-    email_recipients = [
-        recipient for recipient in recipients
-        if recipient.email and recipient.pk != excluded_user_id and getattr(
-            UserProfile.get_for_user(recipient),
-            notification + '_notifications'
-        )
-    ]
+    # Get the notification preference and preferred language of every recipient in a single query
+    recipient_profiles = {
+        user_id: (notifications_enabled, preferred_language)
+        for user_id, notifications_enabled, preferred_language in UserProfile.objects.filter(
+            user__in=[recipient.pk for recipient in recipients]
+        ).values_list('user_id', notification + '_notifications', 'preferred_language')
+    }
+
+    # Get list of email addresses, along with the language to send each email in.
+    # Recipients without a profile get the defaults of an unsaved UserProfile
+    default_profile = UserProfile()
+    profile_defaults = (
+        getattr(default_profile, notification + '_notifications'), default_profile.preferred_language
+    )
+    email_recipients = []
+    for recipient in recipients:
+        notifications_enabled, preferred_language = recipient_profiles.get(recipient.pk, profile_defaults)
+        if recipient.email and recipient.pk != excluded_user_id and notifications_enabled:
+            email_recipients.append((recipient, preferred_language or get_language()))
 
     # Return if there are no email addresses
     if not email_recipients:
         return True
 
-    # Get template
-    template_subject = 'wagtailadmin/notifications/' + notification + '_subject.txt'
-    template_text = 'wagtailadmin/notifications/' + notification + '.txt'
-    template_html = 'wagtailadmin/notifications/' + notification + '.html'
+    # Get templates. These are loaded once rather than for each recipient: compiled
+    # templates don't depend on the active language, so they can be shared between recipients
+    use_html = getattr(settings, 'WAGTAILADMIN_NOTIFICATION_USE_HTML', False)
+    try:
+        subject_template = get_template(template_subject)
+        text_template = get_template(template_text)
+        html_template = get_template(template_html) if use_html else None
+    except (TemplateDoesNotExist, TemplateSyntaxError):
+        logger.exception("Failed to load templates for '%s' notification emails", notification)
+        return False
 
     # Common context to template
     context = {
@@ -107,20 +141,20 @@ def send_notification(page_revision_id, notification, excluded_user_id):
 
         # Send emails
         sent_count = 0
-        for recipient in email_recipients:
+        for recipient, language in email_recipients:
             try:
                 # update context with this recipient
                 context["user"] = recipient
 
                 # Translate text to the recipient language settings
-                with override(recipient.wagtail_userprofile.get_preferred_language()):
+                with override(language):
                     # Get email subject and content
-                    email_subject = render_to_string(template_subject, context).strip()
-                    email_content = render_to_string(template_text, context).strip()
+                    email_subject = subject_template.render(context).strip()
+                    email_content = text_template.render(context).strip()
 
                 kwargs = {}
-                if getattr(settings, 'WAGTAILADMIN_NOTIFICATION_USE_HTML', False):
-                    kwargs['html_message'] = render_to_string(template_html, context)
+                if html_template:
+                    kwargs['html_message'] = html_template.render(context)
 
                 # Send email
                 send_mail(email_subject, email_content, [recipient.email], connection=open_connection, **kwargs)
@@ -203,10 +237,12 @@ class EmailNotificationMixin:
         """Filters notification recipients to those allowing the notification type on their UserProfile, and those
         with an email address"""
 
-        return {recipient for recipient in self.get_recipient_users(instance, **kwargs) if recipient.email and getattr(
-            UserProfile.get_for_user(recipient),
-            self.notification + '_notifications'
-        )}
+        notifications_enabled = attrgetter(self.notification + '_notifications')
+
+        return {
+            recipient for recipient in self.get_recipient_users(instance, **kwargs)
+            if recipient.email and notifications_enabled(UserProfile.get_for_user(recipient))
+        }
 
     def get_template_set(self, instance, **kwargs):
         """Return a dictionary of template paths for the templates for the email subject and the text and html
@@ -225,6 +261,20 @@ class EmailNotificationMixin:
 
     def send_emails(self, template_set, context, recipients, **kwargs):
 
+        if not recipients:
+            return True
+
+        # Look up the WAGTAILADMIN_NOTIFICATION_USE_HTML setting and load the templates once,
+        # rather than for each recipient
+        use_html = getattr(settings, 'WAGTAILADMIN_NOTIFICATION_USE_HTML', False)
+        try:
+            subject_template = get_template(template_set['subject'])
+            text_template = get_template(template_set['text'])
+            html_template = get_template(template_set['html']) if use_html else None
+        except (TemplateDoesNotExist, TemplateSyntaxError):
+            logger.exception("Failed to load notification email templates %s", template_set)
+            return False
+
         connection = get_connection()
         sent_count = 0
         try:
@@ -240,12 +290,12 @@ class EmailNotificationMixin:
                         # Translate text to the recipient language settings
                         with override(recipient.wagtail_userprofile.get_preferred_language()):
                             # Get email subject and content
-                            email_subject = render_to_string(template_set['subject'], context).strip()
-                            email_content = render_to_string(template_set['text'], context).strip()
+                            email_subject = subject_template.render(context).strip()
+                            email_content = text_template.render(context).strip()
 
                         kwargs = {}
-                        if getattr(settings, 'WAGTAILADMIN_NOTIFICATION_USE_HTML', False):
-                            kwargs['html_message'] = render_to_string(template_set['html'], context)
+                        if html_template:
+                            kwargs['html_message'] = html_template.render(context)
 
                         # Send email
                         send_mail(email_subject, email_content, [recipient.email], connection=open_connection, **kwargs)
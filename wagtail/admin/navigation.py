@@ -38,9 +38,17 @@ def get_site_for_user(user):
         root_site = None
     real_site_name = None
     if root_site:
-        real_site_name = root_site.site_name if root_site.site_name else root_site.hostname
+        real_site_name = root_site.site_name or root_site.hostname
     return {
         'root_page': root_page,
         'root_site': root_site,
-        'site_name': real_site_name if real_site_name else settings.WAGTAIL_SITE_NAME,
+        'site_name': real_site_name or settings.WAGTAIL_SITE_NAME,
     }
+
+
+def get_site_for_request(request):
+    # get_site_for_user for the current user. This is called by several dashboard components
+    # while rendering a single admin page, so the result is cached on the request
+    if not hasattr(request, '_wagtail_site_for_user'):
+        request._wagtail_site_for_user = get_site_for_user(request.user)
+    return request._wagtail_site_for_user
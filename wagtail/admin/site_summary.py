@@ -1,7 +1,7 @@
 from django.template.loader import render_to_string
 
 from wagtail.admin.auth import user_has_any_page_permission
-from wagtail.admin.navigation import get_site_for_user
+from wagtail.admin.navigation import get_site_for_request
 from wagtail.core import hooks
 from wagtail.core.models import Page, Site
 
@@ -27,7 +27,7 @@ class PagesSummaryItem(SummaryItem):
     template = 'wagtailadmin/home/site_summary_pages.html'
 
     def get_context(self):
-        site_details = get_site_for_user(self.request.user)
+        site_details = get_site_for_request(self.request)
         root_page = site_details['root_page']
         site_name = site_details['site_name']
 
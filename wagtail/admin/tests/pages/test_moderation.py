@@ -6,10 +6,14 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, Permission
 from django.contrib.messages import constants as message_constants
 from django.core import mail
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from wagtail.admin.mail import send_notification
 from wagtail.core.models import Page, PageRevision
 from wagtail.core.signals import page_published
 from wagtail.tests.testapp.models import SimplePage
@@ -242,6 +246,20 @@ class TestNotificationPreferences(TestCase, WagtailTestUtils):
         self.assertEqual(mail.outbox[0].to, ['submitter@email.com'])
         self.assertEqual(mail.outbox[0].subject, 'The page "Hello world!" has been approved')
 
+    @override_settings(WAGTAILADMIN_NOTIFICATION_USE_HTML=True)
+    def test_approved_notifications_html(self):
+        # Set up the page version
+        self.silent_submit()
+        # Approve
+        self.approve()
+
+        # Submitter must receive an approved email with an HTML alternative
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(len(mail.outbox[0].alternatives), 1)
+        html_content, mimetype = mail.outbox[0].alternatives[0]
+        self.assertEqual(mimetype, 'text/html')
+        self.assertIn('has been approved', html_content)
+
     def test_approved_notifications_preferences_respected(self):
         # Submitter doesn't want 'approved' emails
         self.submitter_profile.approved_notifications = False
@@ -255,6 +273,33 @@ class TestNotificationPreferences(TestCase, WagtailTestUtils):
         # No email to send
         self.assertEqual(len(mail.outbox), 0)
 
+    def test_approved_notifications_without_profile(self):
+        # Submitter has no profile, so falls back to the default preferences
+        self.submitter_profile.delete()
+
+        # Set up the page version
+        self.silent_submit()
+        # Approve
+        self.approve()
+
+        # Submitter must receive an approved email
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['submitter@email.com'])
+
+    def test_approved_notifications_preferred_language(self):
+        # Submitter reads the admin in French
+        self.submitter_profile.preferred_language = 'fr'
+        self.submitter_profile.save()
+
+        # Set up the page version
+        self.silent_submit()
+        # Approve
+        self.approve()
+
+        # Email is translated to the submitter's preferred language
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'La page "Hello world!" a été approuvée')
+
     def test_rejected_notifications(self):
         # Set up the page version
         self.silent_submit()
@@ -297,6 +342,58 @@ class TestNotificationPreferences(TestCase, WagtailTestUtils):
         self.assertIn(self.moderator.email, email_to)
         self.assertNotIn(self.moderator2.email, email_to)
 
+    def test_template_error(self):
+        self.silent_submit()
+
+        logging.disable(logging.CRITICAL)
+        with mock.patch('wagtail.admin.mail.get_template', side_effect=TemplateSyntaxError('Broken template')):
+            response = self.approve()
+        with mock.patch('wagtail.admin.mail.get_template', side_effect=TemplateDoesNotExist('approved.txt')):
+            result = send_notification(self.revision.id, 'approved', self.user.pk)
+        logging.disable(logging.NOTSET)
+
+        # A broken or missing template should report a failure rather than crash the page
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(result)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_unknown_notification(self):
+        self.silent_submit()
+
+        with self.assertNumQueries(0):
+            self.assertFalse(send_notification(self.revision.id, 'unknown', self.user.pk))
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_submitted_notifications_share_connection(self):
+        self.silent_submit()
+
+        with mock.patch('wagtail.admin.mail.get_connection', wraps=get_connection) as mock_get_connection:
+            self.assertTrue(send_notification(self.revision.id, 'submitted', self.user.pk))
+
+        # Both moderators are emailed over the same connection
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mock_get_connection.call_count, 1)
+
+    def test_submitted_notification_queries_do_not_depend_on_recipient_count(self):
+        self.silent_submit()
+
+        with CaptureQueriesContext(connection) as two_recipient_queries:
+            send_notification(self.revision.id, 'submitted', self.user.pk)
+        self.assertEqual(len(mail.outbox), 2)
+
+        # Add more moderators, with and without profiles
+        User = get_user_model()
+        for i in range(3, 6):
+            moderator = User.objects.create_superuser('moderator%d' % i, 'moderator%d@email.com' % i, 'password')
+            if i % 2:
+                UserProfile.get_for_user(moderator)
+
+        with CaptureQueriesContext(connection) as five_recipient_queries:
+            send_notification(self.revision.id, 'submitted', self.user.pk)
+        self.assertEqual(len(mail.outbox), 7)
+
+        self.assertEqual(len(five_recipient_queries), len(two_recipient_queries))
+
     @mock.patch.object(EmailMultiAlternatives, 'send', side_effect=IOError('Server down'))
     def test_email_send_error(self, mock_fn):
         logging.disable(logging.CRITICAL)
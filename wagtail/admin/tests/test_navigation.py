@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
 
 from wagtail.admin.navigation import (
-    get_explorable_root_page, get_pages_with_direct_explore_permission)
+    get_explorable_root_page, get_pages_with_direct_explore_permission, get_site_for_request,
+    get_site_for_user)
 from wagtail.tests.utils import WagtailTestUtils
 
 
@@ -83,3 +84,28 @@ class TestExplorablePages(TestCase, WagtailTestUtils):
         User = get_user_model()
         user = User.objects.get(username='mary')
         self.assertEqual(get_explorable_root_page(user), None)
+
+    def test_site_for_nonadmin(self):
+        User = get_user_model()
+        user = User.objects.get(username='bob')
+        site_details = get_site_for_user(user)
+        self.assertEqual(site_details['root_page'].id, 6)
+        self.assertEqual(site_details['root_site'].hostname, 'example.com')
+        self.assertEqual(site_details['site_name'], 'example.com')
+
+    def test_site_for_nonadmin_with_no_page_perms(self):
+        User = get_user_model()
+        user = User.objects.get(username='mary')
+        site_details = get_site_for_user(user)
+        self.assertIsNone(site_details['root_page'])
+        self.assertIsNone(site_details['root_site'])
+        self.assertEqual(site_details['site_name'], 'Test Site')
+
+    def test_site_for_request_is_cached_on_request(self):
+        User = get_user_model()
+        request = RequestFactory().get('/')
+        request.user = User.objects.get(username='jane')
+        site_details = get_site_for_request(request)
+        self.assertEqual(site_details, get_site_for_user(request.user))
+        with self.assertNumQueries(0):
+            self.assertEqual(get_site_for_request(request), site_details)
@@ -11,6 +11,8 @@ from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from freezegun import freeze_time
+
+from wagtail.admin.mail import WorkflowStateSubmissionEmailNotifier
 from wagtail.core.models import (
     GroupApprovalTask, Page, Task, TaskState, Workflow, WorkflowPage, WorkflowState, WorkflowTask)
 from wagtail.core.signals import page_published
@@ -1241,6 +1243,39 @@ class TestNotificationPreferences(TestCase, WagtailTestUtils):
         # as the submitter was the triggering user, the submitter should not get an email notification
         self.assertNotIn(self.submitter.email, workflow_submission_emailed_addresses)
 
+    @override_settings(WAGTAILADMIN_NOTIFICATION_USE_HTML=True)
+    def test_submitted_email_notifications_html(self):
+        """Test that 'submitted' notifications include an HTML alternative when
+        `WAGTAILADMIN_NOTIFICATION_USE_HTML` is set"""
+        self.login(self.submitter)
+        self.submit()
+
+        self.assertEqual(len(mail.outbox), 4)
+        for email in mail.outbox:
+            self.assertEqual(len(email.alternatives), 1)
+            html_content, mimetype = email.alternatives[0]
+            self.assertEqual(mimetype, 'text/html')
+            self.assertIn('<html', html_content)
+
+    def test_send_emails_missing_templates(self):
+        """Test that missing templates are logged and reported as a failure, rather than raising"""
+        notifier = WorkflowStateSubmissionEmailNotifier()
+        template_set = {
+            'subject': 'wagtailadmin/notifications/my_task_state_submitted_subject.txt',
+            'text': 'wagtailadmin/notifications/my_task_state_submitted.txt',
+            'html': 'wagtailadmin/notifications/my_task_state_submitted.html',
+        }
+
+        # With no recipients, there is nothing to send and the templates aren't loaded
+        self.assertTrue(notifier.send_emails(template_set, {}, []))
+
+        logging.disable(logging.CRITICAL)
+        result = notifier.send_emails(template_set, {}, [self.moderator])
+        logging.disable(logging.NOTSET)
+
+        self.assertFalse(result)
+        self.assertEqual(len(mail.outbox), 0)
+
     @override_settings(WAGTAILADMIN_NOTIFICATION_INCLUDE_SUPERUSERS=False)
     def test_submitted_email_notifications_superuser_settings(self):
         """Test that 'submitted' notifications for WorkflowState and TaskState are not sent to superusers if
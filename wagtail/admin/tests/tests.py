@@ -6,12 +6,15 @@ from django import VERSION as DJANGO_VERSION
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, Permission
 from django.core import mail
-from django.test import TestCase, override_settings
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse, reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from taggit.models import Tag
 
-from wagtail.admin.auth import user_has_any_page_permission
+from wagtail.admin.auth import (
+    any_permission_required, user_has_any_page_permission, users_with_page_permission)
 from wagtail.admin.mail import send_mail
 from wagtail.admin.menu import MenuItem
 from wagtail.core.models import Page
@@ -292,6 +295,90 @@ class TestUserPassesTestPermissionDecorator(TestCase):
         self.assertEqual(response.status_code, 403)
 
 
+class TestAnyPermissionRequiredDecorator(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+        @any_permission_required('wagtailcore.add_collection', 'wagtailcore.change_collection')
+        def view(request):
+            return HttpResponse("ok")
+
+        self.view = view
+
+    def get(self, user, **extra):
+        request = self.factory.get('/', **extra)
+        request.user = user
+        return self.view(request)
+
+    def test_user_with_one_permission(self):
+        user = get_user_model().objects.create_user(
+            username='editor', email='ed@example.com', password='p')
+        user.user_permissions.add(
+            Permission.objects.get(content_type__app_label='wagtailcore', codename='change_collection')
+        )
+        self.assertEqual(self.get(user).status_code, 200)
+
+    def test_superuser(self):
+        user = get_user_model().objects.create_superuser(
+            username='superuser', email='admin@example.com', password='p')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get(user).status_code, 200)
+
+    def test_user_without_permission(self):
+        user = get_user_model().objects.create_user(
+            username='pleb', email='pleb@example.com', password='p')
+        user.user_permissions.add(
+            Permission.objects.get(content_type__app_label='wagtailcore', codename='delete_collection')
+        )
+        with self.assertRaises(PermissionDenied):
+            self.get(user, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+    def test_many_permissions(self):
+        @any_permission_required(
+            'wagtailcore.add_collection', 'wagtailcore.change_collection', 'wagtailcore.delete_collection'
+        )
+        def view(request):
+            return HttpResponse("ok")
+
+        self.view = view
+
+        user = get_user_model().objects.create_user(
+            username='editor', email='ed@example.com', password='p')
+        user.user_permissions.add(
+            Permission.objects.get(content_type__app_label='wagtailcore', codename='delete_collection')
+        )
+        self.assertEqual(self.get(user).status_code, 200)
+
+        user = get_user_model().objects.create_user(
+            username='pleb', email='pleb@example.com', password='p')
+        with self.assertRaises(PermissionDenied):
+            self.get(user, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+    @override_settings(AUTHENTICATION_BACKENDS=['wagtail.admin.tests.tests.HasPermOnlyBackend'])
+    def test_many_permissions_with_has_perm_only_backend(self):
+        @any_permission_required(
+            'wagtailcore.add_collection', 'wagtailcore.change_collection', 'wagtailcore.delete_collection'
+        )
+        def view(request):
+            return HttpResponse("ok")
+
+        self.view = view
+
+        # The backend grants delete_collection through has_perm alone
+        user = get_user_model().objects.create_user(
+            username='editor', email='ed@example.com', password='p')
+        self.assertEqual(self.get(user).status_code, 200)
+
+
+class HasPermOnlyBackend:
+    """
+    An authentication backend that only implements has_perm, and grants
+    the wagtailcore.delete_collection permission to everyone
+    """
+    def has_perm(self, user_obj, perm, obj=None):
+        return perm == 'wagtailcore.delete_collection'
+
+
 class TestUserHasAnyPagePermission(TestCase):
     def test_superuser(self):
         user = get_user_model().objects.create_superuser(
@@ -326,6 +413,58 @@ class TestUserHasAnyPagePermission(TestCase):
         )
         self.assertFalse(user_has_any_page_permission(user))
 
+    def test_superuser_does_not_query(self):
+        user = get_user_model().objects.create_superuser(
+            username='superuser', email='admin@example.com', password='p')
+        with self.assertNumQueries(0):
+            self.assertTrue(user_has_any_page_permission(user))
+
+    def test_result_is_cached_on_user(self):
+        user = get_user_model().objects.create_user(
+            username='editor', email='ed@example.com', password='p')
+        user.groups.add(Group.objects.get(name='Editors'))
+        with self.assertNumQueries(1):
+            self.assertTrue(user_has_any_page_permission(user))
+            self.assertTrue(user_has_any_page_permission(user))
+
+
+class TestUsersWithPagePermission(TestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        User = get_user_model()
+        self.superuser = User.objects.get(email='superuser@example.com')
+        self.event_editor = User.objects.get(email='eventeditor@example.com')
+        self.event_moderator = User.objects.get(email='eventmoderator@example.com')
+        self.inactive_user = User.objects.get(email='inactiveuser@example.com')
+        self.site_editor = User.objects.get(email='siteeditor@example.com')
+
+        self.events_index = Page.objects.get(url_path='/home/events/')
+        self.christmas_page = Page.objects.get(url_path='/home/events/christmas/')
+
+    def test_permission_on_ancestor(self):
+        with self.assertNumQueries(1):
+            users = list(users_with_page_permission(self.christmas_page, 'publish'))
+
+        self.assertIn(self.event_moderator, users)
+        self.assertIn(self.superuser, users)
+        self.assertNotIn(self.event_editor, users)
+        self.assertNotIn(self.inactive_user, users)
+        self.assertEqual(len(users), len(set(users)))
+
+    def test_permission_on_page_itself(self):
+        users = list(users_with_page_permission(self.events_index, 'edit'))
+
+        self.assertIn(self.event_moderator, users)
+        self.assertIn(self.site_editor, users)
+        self.assertNotIn(self.event_editor, users)
+
+    def test_exclude_superusers(self):
+        users = list(users_with_page_permission(self.christmas_page, 'publish', include_superusers=False))
+
+        self.assertIn(self.event_moderator, users)
+        self.assertNotIn(self.superuser, users)
+
 
 class Test404(TestCase, WagtailTestUtils):
     def test_admin_404_template_used(self):
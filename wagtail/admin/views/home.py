@@ -7,7 +7,7 @@ from django.http import Http404
 from django.template.loader import render_to_string
 from django.template.response import TemplateResponse
 
-from wagtail.admin.navigation import get_site_for_user
+from wagtail.admin.navigation import get_site_for_request
 from wagtail.admin.site_summary import SiteSummaryPanel
 from wagtail.core import hooks
 from wagtail.core.models import (
@@ -166,7 +166,7 @@ def home(request):
     for fn in hooks.get_hooks('construct_homepage_panels'):
         fn(request, panels)
 
-    site_details = get_site_for_user(request.user)
+    site_details = get_site_for_request(request)
 
     return TemplateResponse(request, "wagtailadmin/home.html", {
         'root_page': site_details['root_page'],